@@ -2,6 +2,7 @@
 or https://minimal-agent.com for a tutorial on the basic building principles.
 """
 
+import asyncio
 import json
 import logging
 import traceback
@@ -96,6 +97,12 @@ class DefaultAgent:
                 break
         return self.messages[-1].get("extra", {})
 
+    async def arun(self, task: str = "", **kwargs) -> dict:
+        """Like `run`, but in a worker thread, so that several agents can wait on the LM concurrently.
+        Cancelling the awaiting task does not stop the thread, which keeps running until the agent finishes.
+        """
+        return await asyncio.to_thread(self.run, task, **kwargs)
+
     def step(self) -> list[dict]:
         """Query the LM, execute actions."""
         return self.execute_actions(self.query())
@@ -7,10 +7,13 @@ There are three modes:
 """
 
 import re
+from contextlib import nullcontext
+from functools import lru_cache
 from typing import Literal, NoReturn
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.rule import Rule
+from rich.text import Text
 
 from minisweagent.agents.default import AgentConfig, DefaultAgent
 from minisweagent.agents.utils.prompt_user import _multiline_prompt, prompt_session
@@ -20,6 +23,12 @@ from minisweagent.models.utils.content_string import get_content_string
 console = Console(highlight=False)
 
 
+@lru_cache(maxsize=16)
+def _compile_whitelist(patterns: tuple[str, ...]) -> tuple[re.Pattern, ...]:
+    """Compile the whitelist regexes once per distinct whitelist."""
+    return tuple(re.compile(p) for p in patterns)
+
+
 class InteractiveAgentConfig(AgentConfig):
     mode: Literal["human", "confirm", "yolo"] = "confirm"
     """Whether to confirm actions."""
@@ -27,10 +36,18 @@ class InteractiveAgentConfig(AgentConfig):
     """Never confirm actions that match these regular expressions."""
     confirm_exit: bool = True
     """If the agent wants to finish, do we ask for confirmation from user?"""
+    quiet: bool = False
+    """Do not print messages, step separators, or the waiting spinner (prompts for user input are still shown)."""
 
 
 class InteractiveAgent(DefaultAgent):
     _MODE_COMMANDS_MAPPING = {"/u": "human", "/c": "confirm", "/y": "yolo"}
+    _HELP_TEXT = Text.from_markup(
+        "[bold green]/y[/bold green] to switch to [bold yellow]yolo[/bold yellow] mode (execute LM commands without confirmation)\n"
+        "[bold green]/c[/bold green] to switch to [bold yellow]confirmation[/bold yellow] mode (ask for confirmation before executing LM commands)\n"
+        "[bold green]/u[/bold green] to switch to [bold yellow]human[/bold yellow] mode (execute commands issued by the user)\n"
+        "[bold green]/m[/bold green] to enter multiline comment"
+    )
 
     def __init__(self, *args, config_class=InteractiveAgentConfig, **kwargs):
         super().__init__(*args, config_class=config_class, **kwargs)
@@ -40,18 +57,20 @@ class InteractiveAgent(DefaultAgent):
         raise UserInterruption({"role": "user", "content": content, "extra": {"interrupt_type": itype}})
 
     def add_messages(self, *messages: dict) -> list[dict]:
-        # Extend supermethod to print messages
+        # Extend supermethod to print messages (rendered together with a single print call)
+        if self.config.quiet:
+            return super().add_messages(*messages)
+        renderables = []
         for msg in messages:
             role, content = msg.get("role") or msg.get("type", "unknown"), get_content_string(msg)
             if role == "assistant":
-                console.print(
-                    f"\n[red][bold]mini-swe-agent[/bold] (step [bold]{self.n_calls}[/bold], [bold]${self.cost:.2f}[/bold]):[/red]\n",
-                    end="",
-                    highlight=False,
-                )
+                header = f"\n[red][bold]mini-swe-agent[/bold] (step [bold]{self.n_calls}[/bold], [bold]${self.cost:.2f}[/bold]):[/red]\n"
             else:
-                console.print(f"\n[bold green]{role.capitalize()}[/bold green]:\n", end="", highlight=False)
-            console.print(content, highlight=False, markup=False)
+                header = f"\n[bold green]{role.capitalize()}[/bold green]:\n"
+            # content is printed verbatim: no markup, and emoji codes like :smile: are not replaced
+            renderables.append(Text.from_markup(header) + Text(content))
+        if renderables:
+            console.print(Group(*renderables))
         return super().add_messages(*messages)
 
     def query(self) -> dict:
@@ -69,7 +88,7 @@ class InteractiveAgent(DefaultAgent):
                     self.add_messages(msg)
                     return msg
         try:
-            with console.status("Waiting for the LM to respond..."):
+            with nullcontext() if self.config.quiet else console.status("Waiting for the LM to respond..."):
                 return super().query()
         except LimitsExceeded:
             console.print(
@@ -80,10 +99,15 @@ class InteractiveAgent(DefaultAgent):
             self.config.cost_limit = float(input("New cost limit: "))
             return super().query()
 
+    async def arun(self, task: str = "", **kwargs) -> NoReturn:
+        # Ctrl-C can't reach step() in a worker thread and the console/prompt session are shared globals
+        raise NotImplementedError("InteractiveAgent needs the terminal and must be run with `run`.")
+
     def step(self) -> list[dict]:
         # Override the step method to handle user interruption
         try:
-            console.print(Rule())
+            if not self.config.quiet:
+                console.print(Rule())
             return super().step()
         except KeyboardInterrupt:
             interruption_message = self._prompt_and_handle_slash_commands(
@@ -107,9 +131,7 @@ class InteractiveAgent(DefaultAgent):
         except Submitted as e:
             self._check_for_new_task_or_submit(e)
         finally:
-            result = self.add_messages(
-                *self.model.format_observation_messages(message, outputs, self.get_template_vars())
-            )
+            result = self._add_observation_messages(message, outputs)
         return result
 
     def _add_observation_messages(self, message: dict, outputs: list[dict]) -> list[dict]:
@@ -124,20 +146,24 @@ class InteractiveAgent(DefaultAgent):
                 "([bold]/h[/bold] for commands)\n"
                 "[bold yellow]>[/bold yellow] "
             )
-            user_input = self._prompt_and_handle_slash_commands(message).strip()
-            if user_input == "/u":  # directly continue
-                self._interrupt("Switched to human mode.")
-            elif user_input in self._MODE_COMMANDS_MAPPING:  # ask again
-                return self._check_for_new_task_or_submit(e)
-            elif user_input:
-                self._interrupt(f"The user added a new task: {user_input}", itype="UserNewTask")
+            while True:
+                user_input = self._prompt_and_handle_slash_commands(message).strip()
+                if user_input in self._MODE_COMMANDS_MAPPING and user_input != "/u":  # ask again
+                    continue
+                if user_input == "/u":  # directly continue
+                    self._interrupt("Switched to human mode.")
+                elif user_input:
+                    self._interrupt(f"The user added a new task: {user_input}", itype="UserNewTask")
+                break
         raise e
 
     def _should_ask_confirmation(self, action: str) -> bool:
-        return self.config.mode == "confirm" and not any(re.match(r, action) for r in self.config.whitelist_actions)
+        if self.config.mode != "confirm":
+            return False
+        return not any(p.match(action) for p in _compile_whitelist(tuple(self.config.whitelist_actions)))
 
     def _ask_confirmation_or_interrupt(self, commands: list[str]) -> None:
-        if not any(self._should_ask_confirmation(c) for c in commands):
+        if self.config.mode != "confirm" or not any(self._should_ask_confirmation(c) for c in commands):
             return
         prompt = (
             f"[bold yellow]Execute {len(commands)} action(s)?[/] [green][bold]Enter[/] to confirm[/], "
@@ -155,29 +181,21 @@ class InteractiveAgent(DefaultAgent):
                     itype="UserRejection",
                 )
 
-    def _prompt_and_handle_slash_commands(self, prompt: str, *, _multiline: bool = False) -> str:
+    def _prompt_and_handle_slash_commands(self, prompt: str) -> str:
         """Prompts the user, takes care of /h (followed by requery) and sets the mode. Returns the user input."""
-        console.print(prompt, end="")
-        if _multiline:
-            return _multiline_prompt()
-        user_input = prompt_session.prompt("")
-        if user_input == "/m":
-            return self._prompt_and_handle_slash_commands(prompt, _multiline=True)
-        if user_input == "/h":
-            console.print(
-                f"Current mode: [bold green]{self.config.mode}[/bold green]\n"
-                f"[bold green]/y[/bold green] to switch to [bold yellow]yolo[/bold yellow] mode (execute LM commands without confirmation)\n"
-                f"[bold green]/c[/bold green] to switch to [bold yellow]confirmation[/bold yellow] mode (ask for confirmation before executing LM commands)\n"
-                f"[bold green]/u[/bold green] to switch to [bold yellow]human[/bold yellow] mode (execute commands issued by the user)\n"
-                f"[bold green]/m[/bold green] to enter multiline comment",
-            )
-            return self._prompt_and_handle_slash_commands(prompt)
-        if user_input in self._MODE_COMMANDS_MAPPING:
-            if self.config.mode == self._MODE_COMMANDS_MAPPING[user_input]:
-                return self._prompt_and_handle_slash_commands(
-                    f"[bold red]Already in {self.config.mode} mode.[/bold red]\n{prompt}"
-                )
-            self.config.mode = self._MODE_COMMANDS_MAPPING[user_input]
-            console.print(f"Switched to [bold green]{self.config.mode}[/bold green] mode.")
+        while True:
+            console.print(prompt, end="")
+            user_input = prompt_session.prompt("")
+            if user_input == "/m":
+                console.print(prompt, end="")
+                return _multiline_prompt()
+            if user_input == "/h":
+                console.print(f"Current mode: [bold green]{self.config.mode}[/bold green]", self._HELP_TEXT, sep="\n")
+                continue
+            if user_input in self._MODE_COMMANDS_MAPPING:
+                if self.config.mode == self._MODE_COMMANDS_MAPPING[user_input]:
+                    prompt = f"[bold red]Already in {self.config.mode} mode.[/bold red]\n{prompt}"
+                    continue
+                self.config.mode = self._MODE_COMMANDS_MAPPING[user_input]
+                console.print(f"Switched to [bold green]{self.config.mode}[/bold green] mode.")
             return user_input
-        return user_input
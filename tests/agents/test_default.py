@@ -1,3 +1,5 @@
+import asyncio
+import threading
 from pathlib import Path
 
 import pytest
@@ -149,6 +151,32 @@ def test_successful_completion(model_factory):
     assert agent.n_calls == 2
 
 
+async def test_arun_runs_agents_concurrently(model_factory):
+    """Test that several agents run concurrently from an event loop."""
+    factory, config = model_factory
+    n_agents = 3
+    barrier = threading.Barrier(n_agents)
+
+    class BarrierEnvironment(LocalEnvironment):
+        def execute(self, action: dict, cwd: str = "", **kwargs) -> dict:
+            barrier.wait(timeout=10)  # only passes if all agents are executing at the same time
+            return super().execute(action, cwd, **kwargs)
+
+    agents = [
+        DefaultAgent(
+            model=factory(
+                [("Finishing", [{"command": f"echo 'COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT'\necho 'agent {i}'"}])]
+            ),
+            env=BarrierEnvironment(),
+            **config,
+        )
+        for i in range(n_agents)
+    ]
+    infos = await asyncio.gather(*(agent.arun("Finish") for agent in agents))
+    assert [info["submission"] for info in infos] == [f"agent {i}\n" for i in range(n_agents)]
+    assert all(info["exit_status"] == "Submitted" for info in infos)
+
+
 def test_step_limit_enforcement(model_factory):
     """Test agent stops when step limit is reached."""
     factory, config = model_factory
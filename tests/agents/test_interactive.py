@@ -1200,3 +1200,86 @@ def test_submission_enter_quits(model_factory):
     assert info["exit_status"] == "Submitted"
     assert info["submission"] == "completed\n"
     assert agent.n_calls == 1
+
+
+def test_should_ask_confirmation_with_multiple_whitelist_patterns(model_factory):
+    """Test that any of several whitelist patterns exempts an action from confirmation."""
+    factory, config = model_factory
+    agent = InteractiveAgent(
+        model=factory([]),
+        env=LocalEnvironment(),
+        **{**config, "whitelist_actions": [r"ls\b", r"cat .*\.py", r"git (status|diff)"]},
+    )
+    assert not agent._should_ask_confirmation("ls -la")
+    assert not agent._should_ask_confirmation("cat foo.py")
+    assert not agent._should_ask_confirmation("git diff HEAD")
+    assert agent._should_ask_confirmation("rm -rf /tmp/x")
+    assert agent._should_ask_confirmation("echo ls")  # patterns are anchored at the start
+    agent.config.whitelist_actions = []
+    assert agent._should_ask_confirmation("ls -la")
+    agent.config.mode = "yolo"
+    assert not agent._should_ask_confirmation("rm -rf /tmp/x")
+
+
+def test_repeated_slash_commands_do_not_recurse(model_factory):
+    """Test that many /h and redundant mode switches at the submission prompt don't exhaust the stack."""
+    factory, config = model_factory
+    with mock_prompts(["/h", "/y"] * 1000 + ["/c", ""]):
+        with patch("minisweagent.agents.interactive.console.print"):
+            agent = InteractiveAgent(
+                model=factory(
+                    [("Finishing", [{"command": "echo 'COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT'\necho 'completed'"}])],
+                ),
+                env=LocalEnvironment(),
+                **{**config, "mode": "yolo"},
+            )
+            info = agent.run("Solve the issue")
+    assert info["exit_status"] == "Submitted"
+    assert info["submission"] == "completed\n"
+    assert agent.config.mode == "confirm"
+
+
+def test_quiet_skips_printing_messages(model_factory):
+    """Test that quiet mode runs the agent without printing messages, step separators, or the spinner."""
+    factory, config = model_factory
+    with (
+        patch("minisweagent.agents.interactive.console.print") as mock_print,
+        patch("minisweagent.agents.interactive.console.status") as mock_status,
+    ):
+        agent = InteractiveAgent(
+            model=factory(
+                [("Finishing", [{"command": "echo 'COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT'\necho 'completed'"}])],
+            ),
+            env=LocalEnvironment(),
+            **{**config, "mode": "yolo", "confirm_exit": False, "quiet": True},
+        )
+        info = agent.run("Solve the issue")
+    assert info["exit_status"] == "Submitted"
+    assert info["submission"] == "completed\n"
+    mock_print.assert_not_called()
+    mock_status.assert_not_called()
+
+
+def test_whitelist_patterns_with_inline_flags_and_backreferences(model_factory):
+    """Test that whitelist patterns are matched independently of each other."""
+    factory, config = model_factory
+    agent = InteractiveAgent(
+        model=factory([]),
+        env=LocalEnvironment(),
+        **{**config, "whitelist_actions": ["ls", "(?i)cat"]},
+    )
+    assert not agent._should_ask_confirmation("CAT foo.py")
+    assert not agent._should_ask_confirmation("ls")
+    assert agent._should_ask_confirmation("LS")
+    agent.config.whitelist_actions = [r"(a)\1", r"(b)\1"]
+    assert not agent._should_ask_confirmation("aa")
+    assert not agent._should_ask_confirmation("bb")
+    assert agent._should_ask_confirmation("ab")
+
+
+async def test_arun_is_not_supported(model_factory):
+    """Test that the interactive agent refuses to run in a worker thread."""
+    factory, config = model_factory
+    agent = InteractiveAgent(model=factory([]), env=LocalEnvironment(), **config)
+    with pytest.raises(NotImplementedError):
+        await agent.arun("Solve the issue")